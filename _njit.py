@@ -0,0 +1,9 @@
+# --- OPTIONAL NUMBA ---
+# Kernels are decorated with @njit; without numba installed they run as plain Python.
+try:
+    from numba import njit
+except ImportError:
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
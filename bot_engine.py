@@ -0,0 +1,443 @@
+import asyncio
+import atexit
+import json
+import logging
+import logging.handlers
+import queue
+import aiohttp
+import numpy as np
+import streamlit as st
+from deriv_api import DerivAPI
+from deriv_api.errors import AddedTaskError, ResponseError
+from websockets.exceptions import WebSocketException
+from datetime import datetime
+from types import SimpleNamespace
+import time
+from indicators import HISTORY, MIN_CLOSES, StreamingIndicators, compute_all
+
+# --- CONFIGURATION ---
+APP_ID = 1089
+SYMBOL = 'R_75'       
+RISK_STAKE = 10.0     
+LEVERAGE = 100        
+
+# STRATEGY
+Z_TRIGGER = -2.0
+ER_FILTER = 0.4
+RSI_BUY_MIN = 55.0    
+RSI_SELL_MAX = 45.0   
+SL_ATR_MULT = 3.0     
+TP_ATR_MULT = 9.0     
+TP_AMOUNT = RISK_STAKE * (TP_ATR_MULT / SL_ATR_MULT)
+GHOST_TIMEOUT = 900   # seconds a squeeze waits for momentum
+RECONNECT_MIN = 0.5   # reconnect backoff (seconds), doubled per failure up to RECONNECT_MAX
+RECONNECT_MAX = 30.0
+CONNECT_TIMEOUT = 10.0 # seconds to wait for authorize, the candle history, or a whole order
+STALE_AFTER = 30.0    # seconds without a stream message before the connection counts as dead
+
+# --- SECRET HANDLING (CRASH PROOF) ---
+MODE = "PAPER" # Default
+API_TOKEN = None
+
+log = logging.getLogger("sniper")
+
+try:
+    DISCORD_URL = st.secrets["discord_webhook"]
+except (KeyError, FileNotFoundError):
+    DISCORD_URL = "PASTE_LOCAL_WEBHOOK_HERE"
+
+try:
+    API_TOKEN = st.secrets["deriv_token"]
+    MODE = "LIVE"
+except (KeyError, FileNotFoundError):
+    MODE = "PAPER" # Fallback if no token found
+
+# --- FAST JSON ---
+# deriv_api decodes every websocket frame with stdlib json; swap in orjson when it's installed
+try:
+    import orjson
+    import deriv_api.deriv_api as _deriv_ws
+    _deriv_ws.json = SimpleNamespace(loads=orjson.loads, dumps=lambda obj: orjson.dumps(obj).decode())
+    dumps_bytes = orjson.dumps
+except ImportError:
+    dumps_bytes = lambda obj: json.dumps(obj).encode()
+
+# --- EVENT LOOP ---
+# libuv-backed loop for the engine when available (uvloop on Linux/macOS, winloop on Windows)
+try:
+    from uvloop import run as run_loop
+except ImportError:
+    try: from winloop import run as run_loop
+    except ImportError: run_loop = asyncio.run
+
+# --- NOTIFICATIONS ---
+_http = None # aiohttp.ClientSession, opened lazily inside the running loop
+_JSON_HEADERS = {"Content-Type": "application/json"}
+_POST_TIMEOUT = aiohttp.ClientTimeout(total=2)
+_pending_posts = set()
+
+def send_discord(msg, color):
+    # Fire-and-forget: the webhook post runs as a task so scans never wait on Discord
+    if "http" not in DISCORD_URL: return
+    task = asyncio.create_task(_post_discord({
+        "embeds": [{"description": msg, "color": color, "timestamp": datetime.now().isoformat()}]
+    }))
+    _pending_posts.add(task)
+    task.add_done_callback(_pending_posts.discard)
+
+async def _post_discord(payload):
+    global _http
+    if _http is None or _http.closed:
+        _http = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=4, ttl_dns_cache=300, keepalive_timeout=60),
+            timeout=_POST_TIMEOUT
+        )
+    try:
+        async with _http.post(DISCORD_URL, data=dumps_bytes(payload), headers=_JSON_HEADERS): pass
+    except (aiohttp.ClientError, asyncio.TimeoutError) as e: log.warning("Discord post failed: %s", e)
+
+# Trade log lines are queued and written by a background listener, keeping file I/O off the loop
+trade_log = logging.getLogger("sniper.trades")
+
+def start_trade_log():
+    log_queue = queue.SimpleQueue()
+    log_file = logging.FileHandler("paper_trading_log.txt", delay=True)
+    log_file.setFormatter(logging.Formatter("[%(asctime)s] %(message)s", "%Y-%m-%d %H:%M:%S"))
+    listener = logging.handlers.QueueListener(log_queue, log_file)
+    listener.start()
+    atexit.register(listener.stop)
+    trade_log.addHandler(logging.handlers.QueueHandler(log_queue))
+    trade_log.setLevel(logging.INFO)
+    trade_log.propagate = False
+
+def log_trade(msg):
+    trade_log.info(msg)
+
+# --- MATH ENGINE ---
+class QuantEngine:
+    def __init__(self, data):
+        self.closes = np.ascontiguousarray(data, dtype=np.float64)
+    
+    def analyze(self):
+        return compute_all(self.closes)
+
+# --- MARKET DATA ---
+class RingBuffer:
+    # Preallocated ring written twice (buf[i] == buf[i + cap]), so the newest values are always
+    # one contiguous slice: push never shifts, last() never copies
+    __slots__ = ("buf", "n", "cap")
+
+    def __init__(self, cap, dtype=np.float64):
+        self.buf = np.zeros(2 * cap, dtype=dtype)
+        self.n = 0
+        self.cap = cap
+
+    def __len__(self): return min(self.n, self.cap)
+
+    def push(self, x):
+        i = self.n % self.cap
+        self.buf[i] = self.buf[i + self.cap] = x
+        self.n += 1
+
+    def set_last(self, x):
+        i = (self.n - 1) % self.cap
+        self.buf[i] = self.buf[i + self.cap] = x
+
+    def reset(self, values):
+        values = values[-self.cap:]
+        n = len(values)
+        self.buf[:n] = self.buf[self.cap:self.cap + n] = values
+        self.n = n
+
+    def last(self, k=None):
+        size = len(self)
+        k = size if k is None else min(k, size)
+        end = (self.n - 1) % self.cap + self.cap + 1
+        return self.buf[end - k:end]
+
+class CandleFeed:
+    # Live candle window kept current by a ticks_history subscription (no polling),
+    # stored in preallocated epoch/close rings so scans never build arrays
+    def __init__(self, api, symbol, count=HISTORY):
+        self.api = api
+        self.symbol = symbol
+        self.count = count
+        self._epochs = RingBuffer(count, dtype=np.int64)
+        self._closes = RingBuffer(count)
+        self.version = 0 # bumped on every stream message
+        self.alive = False
+        self.error = None # set once the stream errors out; the feed is then replaced, not restarted
+        self.last_message = 0.0 # time.monotonic() of the last stream message
+        self.updated = asyncio.Event() # set on every push from the stream
+
+    @property
+    def size(self): return len(self._closes)
+
+    @property
+    def epochs(self): return self._epochs.last()
+
+    @property
+    def closes(self): return self._closes.last()
+
+    async def start(self):
+        source = await self.api.subscribe({
+            'ticks_history': self.symbol, 'count': self.count, 'end': 'latest',
+            'style': 'candles', 'granularity': 60, 'subscribe': 1
+        })
+        source.subscribe(on_next=self._on_message, on_error=self._on_error)
+        self.alive = True
+        await self.updated.wait() # the candle history (or the error) is the first message
+        return self
+
+    def _on_message(self, msg):
+        self.version += 1
+        self.last_message = time.monotonic()
+        self.updated.set()
+        if 'candles' in msg:
+            # Full history arrives once per (re)subscription
+            candles = msg['candles'][-self.count:]
+            n = len(candles)
+            self._epochs.reset(np.fromiter((c['epoch'] for c in candles), dtype=np.int64, count=n))
+            self._closes.reset(np.fromiter((c['close'] for c in candles), dtype=np.float64, count=n))
+        elif 'ohlc' in msg:
+            epoch, close = int(msg['ohlc']['open_time']), float(msg['ohlc']['close'])
+            if self.size and self._epochs.last(1)[0] == epoch:
+                self._closes.set_last(close)
+                return
+            self._epochs.push(epoch)
+            self._closes.push(close)
+
+    def _on_error(self, e):
+        self.alive = False
+        self.error = e
+        self.updated.set()
+        log.warning("Candle stream for %s dropped: %s", self.symbol, e)
+
+# --- CONNECTION ---
+class ConnectionLost(Exception):
+    # The Deriv session is unusable; main_loop hands it to ResilientDerivAPI.recover
+    pass
+
+class ResilientDerivAPI:
+    # Owns the Deriv session; when the socket dies it is rebuilt (connect, authorize, subscribe)
+    # after an exponential backoff that resets once data flows again
+    def __init__(self, symbol):
+        self.symbol = symbol
+        self.api = None
+        self.feed = None
+        self.authorized = False
+        self.auth_failed = False # token rejected; retried on its own backoff
+        self.auth_backoff = RECONNECT_MIN
+        self.auth_retry_at = 0.0
+        self.error = None # fatal connection error reported by deriv_api
+        self._sanity = None
+        self.backoff = RECONNECT_MIN
+        self.down = False
+
+    async def ensure(self):
+        # Restore the socket and the candle subscription; authorization is separate (authorize)
+        # so a rejected token never stops the scan
+        if self.api is None:
+            self.api = DerivAPI(app_id=APP_ID)
+            self.feed = CandleFeed(self.api, self.symbol)
+            self.authorized = MODE != "LIVE"
+            self.error = None
+            self._sanity = self.api.sanity_errors.subscribe(on_next=self._on_sanity_error)
+        self.check()
+        # deriv_api requests on a dead socket never complete, so each one here is bounded
+        try:
+            if not self.feed.alive: await asyncio.wait_for(self.feed.start(), CONNECT_TIMEOUT)
+        except asyncio.TimeoutError:
+            raise ConnectionLost(f"no response within {CONNECT_TIMEOUT:.0f}s") from None
+        self.check()
+        if time.monotonic() - self.feed.last_message > STALE_AFTER:
+            raise ConnectionLost(f"no stream data for {STALE_AFTER:.0f}s")
+        return self.feed
+
+    async def authorize(self):
+        # Authorize once per session so trades only pay the proposal/buy round-trips. Only
+        # orders wait on this; a rejected token alerts once and is retried on a backoff.
+        if self.authorized or time.monotonic() < self.auth_retry_at: return self.authorized
+        try:
+            await asyncio.wait_for(self.api.authorize(API_TOKEN), CONNECT_TIMEOUT)
+        except asyncio.TimeoutError:
+            raise ConnectionLost(f"authorize got no response within {CONNECT_TIMEOUT:.0f}s") from None
+        except ResponseError as e:
+            log.warning("Authorize rejected (%s); retrying in %.1fs", e, self.auth_backoff)
+            if not self.auth_failed:
+                send_discord(f"❌ **AUTHORIZE FAILED**\n{e.message}\nScanning continues; orders are blocked", 10038562)
+                self.auth_failed = True
+            self.auth_retry_at = time.monotonic() + self.auth_backoff
+            self.auth_backoff = min(self.auth_backoff * 2, RECONNECT_MAX)
+            return False
+        self.authorized = True
+        self.auth_backoff = RECONNECT_MIN
+        if self.auth_failed:
+            send_discord("🟢 **AUTHORIZED**\nLive orders enabled", 3066993)
+            self.auth_failed = False
+        return True
+
+    def check(self):
+        if self.error is not None or self.api.connected.is_rejected():
+            raise ConnectionLost(self.error or "socket closed")
+        # deriv_api keeps serving an errored subscription from its cache, so a failed stream
+        # (rate limit, validation) is only retried on a fresh client, after the backoff
+        if self.feed.error is not None: raise ConnectionLost(self.feed.error)
+
+    def _on_sanity_error(self, e):
+        # deriv_api never raises a dropped socket or a failed connect to its callers; both only
+        # surface here (the rest, e.g. "Extra response", is noise)
+        if isinstance(e, WebSocketException) or (
+                isinstance(e, AddedTaskError) and e.name == "deriv_api:api_connect"):
+            self.error = e
+            self.feed.updated.set() # wake main_loop now rather than on the next heartbeat
+
+    async def recover(self, e):
+        log.warning("Deriv connection lost (%s); reconnecting in %.1fs", e, self.backoff)
+        if not self.down:
+            send_discord(f"🔴 **CONNECTION LOST**\n{e}\nReconnecting...", 10038562)
+            self.down = True
+        await asyncio.sleep(self.backoff)
+        self.backoff = min(self.backoff * 2, RECONNECT_MAX)
+        api, self.api = self.api, None
+        if self._sanity is not None: self._sanity.dispose()
+        if api is not None:
+            try: await api.clear()
+            except WebSocketException: pass # already closed
+
+    def healthy(self):
+        # Called on every fresh stream message
+        self.backoff = RECONNECT_MIN
+        if self.down:
+            send_discord(f"🟢 **RECONNECTED**\nStream restored for {self.symbol}", 3066993)
+            self.down = False
+
+# --- EXECUTION ENGINE (DUAL MODE) ---
+async def place_order(api, contract_type, tp_amount):
+    proposal = await api.proposal({
+        "proposal": 1, "amount": RISK_STAKE, "basis": "stake",
+        "contract_type": contract_type, "currency": "USD",
+        "symbol": SYMBOL, "multiplier": LEVERAGE
+    })
+    prop_id = proposal['proposal']['id']
+    buy_order = await api.buy({"buy": prop_id, "price": RISK_STAKE + 20})
+    contract_id = buy_order['buy']['contract_id']
+    await api.contract_update_history(contract_id, {
+        "contract_id": contract_id,
+        "limit_order": {"take_profit": round(tp_amount, 2)}
+    })
+
+async def submit_order(api, contract_type, tp_amount):
+    try:
+        await place_order(api, contract_type, tp_amount)
+    except ResponseError as e:
+        if e.code != "AuthorizationRequired": raise
+        await api.authorize(API_TOKEN) # session lost its authorization: re-auth and retry once
+        await place_order(api, contract_type, tp_amount)
+
+async def execute_trade(session, direction, tp_amount):
+    if MODE == "PAPER":
+        # SIMULATION
+        msg = f"📝 **PAPER TRADE: {direction}**\nStake: ${RISK_STAKE}\nTarget: ${round(tp_amount, 2)}"
+        send_discord(msg, 16776960) # Yellow for Paper
+        log_trade(f"PAPER EXECUTION: {direction}")
+        return True
+    
+    elif MODE == "LIVE":
+        # REAL EXECUTION (Requires Token; the session is authorized once by main_loop)
+        contract_type = "MULTUP" if direction == "BUY" else "MULTDOWN"
+        api = session.api
+        if not session.authorized:
+            send_discord(f"❌ LIVE FAIL: {direction} skipped, session not authorized", 10038562)
+            return False
+        try:
+            session.check()
+            # In-flight requests are never failed when the socket drops, so the order is bounded
+            # and a lost connection is handed on to main_loop's recovery
+            await asyncio.wait_for(submit_order(api, contract_type, tp_amount), CONNECT_TIMEOUT)
+            send_discord(f"⚡ **LIVE EXECUTION: {direction}**", 5763719)
+            return True
+        except (ConnectionLost, asyncio.TimeoutError) as e:
+            reason = session.error or (
+                e if isinstance(e, ConnectionLost) else f"no response within {CONNECT_TIMEOUT:.0f}s")
+            send_discord(f"❌ LIVE FAIL: {direction} lost with the connection ({reason})\n"
+                         "Check the account for an open contract", 10038562)
+            raise ConnectionLost(reason) from None
+        except Exception as e:
+            send_discord(f"❌ LIVE FAIL: {str(e)}", 10038562)
+            return False
+
+# --- MAIN LOOP ---
+def publish(updates, snapshot):
+    # Latest-value channel to the dashboard: replace an unread snapshot instead of queueing stale ones
+    try: updates.get_nowait()
+    except queue.Empty: pass
+    try: updates.put_nowait(snapshot)
+    except queue.Full: pass
+
+async def main_loop(updates=None):
+    state = SimpleNamespace(ghost_order=None, streams={})
+    session = ResilientDerivAPI(SYMBOL)
+    feed = None
+    send_discord(f"🟢 **SYSTEM ONLINE**\nMode: {MODE} TRADING", 3066993)
+    seen = None # feed version of the last scan
+    
+    while True:
+        try:
+            feed = await session.ensure()
+            if MODE == "LIVE": await session.authorize()
+            feed.updated.clear()
+            # Heartbeat wake-ups with no new data only matter while a ghost order can expire
+            if feed.size >= MIN_CLOSES and (feed.version != seen or state.ghost_order is not None):
+                if feed.version != seen: session.healthy()
+                seen = feed.version
+                epochs, closes = feed.epochs, feed.closes
+                stream = state.streams.get(SYMBOL)
+                if stream is None or not stream.sync(epochs, closes):
+                    # Cold start or a gap in history: full pass, then stream from here
+                    z, er, atr, rsi, price = QuantEngine(closes).analyze()
+                    state.streams[SYMBOL] = StreamingIndicators.from_arrays(epochs, closes)
+                else:
+                    z, er, atr, rsi, price = stream.analyze()
+                if updates is not None:
+                    publish(updates, {"z": z, "rsi": rsi, "ghost": state.ghost_order is not None})
+                
+                order = state.ghost_order
+                if order is None:
+                    if er > ER_FILTER and z < Z_TRIGGER: # ER fails first in noise
+                        half = atr * 0.5
+                        state.ghost_order = {
+                            "buy_lvl": price + half, "sell_lvl": price - half,
+                            "atr": atr, "created": time.monotonic()
+                        }
+                        send_discord(f"👀 **SQUEEZE FOUND**\nWaiting for Momentum...", 16776960)
+                else:
+                    if time.monotonic() - order['created'] > GHOST_TIMEOUT:
+                        state.ghost_order = None; continue
+                    
+                    # buy_lvl > sell_lvl, so at most one side can match either way round
+                    # The ghost is spent before the order goes out: a failed or lost order is
+                    # reported, never re-fired after a reconnect
+                    if rsi > RSI_BUY_MIN and price >= order['buy_lvl']:
+                        state.ghost_order = None
+                        await execute_trade(session, "BUY", TP_AMOUNT)
+                    elif rsi < RSI_SELL_MAX and price <= order['sell_lvl']:
+                        state.ghost_order = None
+                        await execute_trade(session, "SELL", TP_AMOUNT)
+                            
+        except (ConnectionLost, WebSocketException) as e: # rebuild the session after a backoff
+            await session.recover(e)
+            seen = None
+            continue
+        except Exception: log.exception("Scan failed") # keep the engine alive, but never silently
+        if feed is None: await asyncio.sleep(2); continue # never got a session: retry on the heartbeat
+        # Event-driven: scan as soon as the stream pushes; the timeout is only a heartbeat for
+        # ghost expiry and restarting a dead stream
+        try: await asyncio.wait_for(feed.updated.wait(), 2)
+        except asyncio.TimeoutError: pass
+
+def run(updates=None):
+    start_trade_log()
+    run_loop(main_loop(updates))
+
+if __name__ == "__main__": run()
\ No newline at end of file
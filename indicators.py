@@ -0,0 +1,221 @@
+import os
+# Keep numba's on-disk cache next to the code so restarts load machine code instead of re-JITing
+os.environ.setdefault("NUMBA_CACHE_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), ".numba_cache"))
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+from collections import deque
+from _njit import njit
+
+# --- INDICATOR KERNELS ---
+ATR_W = 14
+RSI_W = 14
+ER_LEN = 10
+Z_W = 20
+Z_LOOKBACK = 100
+# compute_all reads Z_W + Z_LOOKBACK closes; StreamingIndicators.from_arrays needs one more
+# because it sets the forming bar aside
+MIN_CLOSES = Z_W + Z_LOOKBACK + 1
+HISTORY = 128   # candles kept per symbol; at least MIN_CLOSES
+
+# Explicit signatures: compiled (or loaded from cache) eagerly at import, never on the first scan
+@njit('f8(f8[::1], i8)', cache=True)
+def wilder(x, w):
+    # Wilder's RMA: SMA of the first w values, then avg = (avg * (w - 1) + v) / w
+    if x.shape[0] < w: return np.nan
+    avg = 0.0
+    for i in range(w): avg += x[i] / w
+    for i in range(w, x.shape[0]): avg = (avg * (w - 1) + x[i]) / w
+    return avg
+
+@njit('f8(f8, f8)', cache=True)
+def _rsi(gain, loss):
+    if loss == 0: return 100.0 if gain > 0 else 50.0
+    return 100.0 - 100.0 / (1.0 + gain / loss)
+
+@njit('Tuple((f8,f8,f8,f8,f8))(f8[::1])', cache=True, fastmath=True)
+def compute_all(close):
+    # One pass over the closes: every indicator shares the same diffs.
+    # ATR and RSI are Wilder RMAs over the whole array; z and ER read the trailing windows.
+    # Returns (z, er, atr, rsi, price) for the latest bar; all NaN (never a signal) if there are
+    # fewer than Z_W + Z_LOOKBACK closes.
+    n = close.shape[0]
+    start = n - Z_W - Z_LOOKBACK
+    if start < 0: return np.nan, np.nan, np.nan, np.nan, np.nan
+    rets = np.empty(Z_W + Z_LOOKBACK - 1)
+    atr = 0.0
+    gain = 0.0
+    loss = 0.0
+    path = 0.0
+    mean = 0.0      # sliding Welford over the last Z_W returns
+    m2 = 0.0
+    vol = 0.0
+    mean_vol = 0.0  # Welford over the last Z_LOOKBACK rolling stdevs
+    m2_vol = 0.0
+    for i in range(1, n):
+        d = close[i] - close[i - 1]
+        g = d if d > 0 else 0.0
+        l = -d if d < 0 else 0.0
+        if i <= ATR_W: atr += abs(d) / ATR_W
+        else: atr = (atr * (ATR_W - 1) + abs(d)) / ATR_W
+        if i <= RSI_W:
+            gain += g / RSI_W
+            loss += l / RSI_W
+        else:
+            gain = (gain * (RSI_W - 1) + g) / RSI_W
+            loss = (loss * (RSI_W - 1) + l) / RSI_W
+        if i <= start: continue
+
+        k = i - start - 1
+        r = d / close[i - 1]
+        rets[k] = r
+        if i >= n - ER_LEN: path += abs(d)
+        if k < Z_W:
+            delta = r - mean
+            mean += delta / (k + 1)
+            m2 += delta * (r - mean)
+        else:
+            y = rets[k - Z_W]
+            old = mean
+            mean += (r - y) / Z_W
+            m2 += (r - y) * (r - mean + y - old)
+        if k >= Z_W - 1:
+            vol = np.sqrt(max(m2, 0.0) / (Z_W - 1))
+            delta = vol - mean_vol
+            mean_vol += delta / (k - Z_W + 2)
+            m2_vol += delta * (vol - mean_vol)
+
+    price = close[n - 1]
+    std_vol = np.sqrt(m2_vol / (Z_LOOKBACK - 1))
+    z = (vol - mean_vol) / std_vol if std_vol != 0 else 0.0
+    er = abs(price - close[n - ER_LEN]) / path if path > 0 else 0.0
+    return z, er, atr, _rsi(gain, loss), price
+
+# --- STREAMING STATE ---
+class _Window:
+    # Fixed-length window with O(1) mean/M2 updates (sliding Welford)
+    __slots__ = ("values", "size", "mean", "m2")
+
+    def __init__(self, size):
+        self.values = deque(maxlen=size)
+        self.size = size
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    def push(self, x):
+        if len(self.values) == self.size:
+            y = self.values[0]
+            old = self.mean
+            self.mean += (x - y) / self.size
+            self.m2 += (x - y) * (x - self.mean + y - old)
+        else:
+            d = x - self.mean
+            self.mean += d / (len(self.values) + 1)
+            self.m2 += d * (x - self.mean)
+        self.values.append(x)
+
+    def fill(self, arr):
+        tail = arr[-self.size:]
+        self.values = deque(tail.tolist(), maxlen=self.size)
+        self.mean = float(tail.mean())
+        self.m2 = float(((tail - self.mean) ** 2).sum())
+
+    def peek(self, x):
+        # (mean, sample variance) as if x were appended to a window one slot larger
+        n = len(self.values) + 1
+        d = x - self.mean
+        mean = self.mean + d / n
+        m2 = self.m2 + d * (x - mean)
+        return mean, max(m2, 0.0) / (n - 1)
+
+class StreamingIndicators:
+    # Closed candles are pushed once; the forming candle is only peeked, so each scan is O(1)
+    def __init__(self, atr_w=ATR_W, rsi_w=RSI_W, er_len=ER_LEN, z_w=Z_W, z_lookback=Z_LOOKBACK):
+        self.er_len = er_len
+        self.z_w = z_w
+        self.span = z_w + z_lookback
+        self.atr_w = atr_w
+        self.rsi_w = rsi_w
+        self._closes = deque(maxlen=er_len - 1)
+        self._atr = 0.0 # Wilder RMAs over every closed bar
+        self._gain = 0.0
+        self._loss = 0.0
+        self._path = _Window(er_len - 1)
+        self._rets = _Window(z_w - 1)
+        self._vols = _Window(z_lookback - 1)
+        self.last_epoch = None
+        self.live = None
+        self._memo_key = None
+        self._memo = None
+
+    @classmethod
+    def from_arrays(cls, epochs, closes, **windows):
+        # Seed the Wilder averages from all closed candles and every window from their tail,
+        # in one vectorized pass
+        self = cls(**windows)
+        closed = np.asarray(closes[:-1], dtype=np.float64)
+        d = np.diff(closed)
+        self._atr = wilder(np.abs(d), self.atr_w)
+        self._gain = wilder(np.maximum(d, 0.0), self.rsi_w)
+        self._loss = wilder(np.maximum(-d, 0.0), self.rsi_w)
+        tail = closed[-self.span:]
+        d = d[-self.span + 1:]
+        rets = d / tail[:-1]
+        self._closes.extend(tail.tolist())
+        self._path.fill(np.abs(d))
+        self._rets.fill(rets)
+        self._vols.fill(sliding_window_view(rets, self.z_w).std(axis=1, ddof=1))
+        self.last_epoch = epochs[-2]
+        self.live = float(closes[-1])
+        return self
+
+    def push(self, close):
+        if self._closes:
+            prev = self._closes[-1]
+            d = close - prev
+            self._atr = self._rma(self._atr, abs(d), self.atr_w)
+            self._gain = self._rma(self._gain, d if d > 0 else 0.0, self.rsi_w)
+            self._loss = self._rma(self._loss, -d if d < 0 else 0.0, self.rsi_w)
+            self._path.push(abs(d))
+            r = close / prev - 1.0
+            if len(self._rets.values) == self._rets.size:
+                self._vols.push(np.sqrt(self._rets.peek(r)[1]))
+            self._rets.push(r)
+        self._closes.append(close)
+
+    @staticmethod
+    def _rma(avg, x, w):
+        return (avg * (w - 1) + x) / w
+
+    def sync(self, epochs, closes):
+        # Push candles closed since the last sync; False if the window no longer overlaps our state
+        i = len(epochs) - 2
+        while i >= 0 and epochs[i] > self.last_epoch: i -= 1
+        if i < 0: return False
+        for close in closes[i + 1:-1]:
+            self.push(float(close))
+        self.last_epoch = epochs[-2]
+        self.live = float(closes[-1])
+        return True
+
+    def analyze(self):
+        # Scans within an unchanged bar (same last closed epoch and live close) reuse the last result
+        key = (self.last_epoch, self.live)
+        if key == self._memo_key: return self._memo
+        price = self.live
+        prev = self._closes[-1]
+        d = price - prev
+        atr = self._rma(self._atr, abs(d), self.atr_w)
+        rsi = _rsi(self._rma(self._gain, d if d > 0 else 0.0, self.rsi_w),
+                   self._rma(self._loss, -d if d < 0 else 0.0, self.rsi_w))
+
+        vol = np.sqrt(self._rets.peek(price / prev - 1.0)[1])
+        mean_vol, var_vol = self._vols.peek(vol)
+        std_vol = np.sqrt(var_vol)
+        z = (vol - mean_vol) / std_vol if std_vol != 0 else 0.0
+
+        path = self._path.peek(abs(d))[0] * self.er_len
+        er = abs(price - self._closes[0]) / path if path > 0 else 0.0
+
+        self._memo_key, self._memo = key, (z, er, atr, rsi, price)
+        return self._memo